@@ -1,13 +1,14 @@
 from django.contrib import admin
 from django.urls import path
-from graphene_django.views import GraphQLView
 from django.views.decorators.csrf import csrf_exempt
 
-from crm.views import home
+from alx_backend_graphql_crm.schema import schema
+from crm.views import CachedGraphQLView, healthz, home
 
 urlpatterns = [
     path('', home, name='home'),
     path('admin/', admin.site.urls),
-    path('graphql', GraphQLView.as_view(graphiql=True)),
+    path('graphql', CachedGraphQLView.as_view(graphiql=True, schema=schema)),
+    path('healthz', healthz, name='healthz'),
 ]
 
@@ -1,19 +1,37 @@
 import datetime
+import logging
 import requests
+from logging.handlers import MemoryHandler
 from gql import gql, Client
 from gql.transport.requests import RequestsHTTPTransport
 
+
+def _buffered_logger(name, log_file, capacity=100):
+    """Return a logger that buffers lines in memory and writes them in batches."""
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        file_handler = logging.FileHandler(log_file, delay=True)
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(
+            MemoryHandler(capacity, flushLevel=logging.ERROR, target=file_handler)
+        )
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+_heartbeat_logger = _buffered_logger("crm.heartbeat", "/tmp/crm_heartbeat_log.txt")
+
+# Shared session so repeated probes reuse the same keep-alive connection.
+_session = requests.Session()
+
+
 def log_crm_heartbeat():
     """Log CRM heartbeat and optionally ping GraphQL."""
     timestamp = datetime.datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
-    log_file = "/tmp/crm_heartbeat_log.txt"
 
     try:
-        response = requests.post(
-            "http://localhost:8000/graphql",
-            json={"query": "{ hello }"},
-            timeout=5,
-        )
+        response = _session.get("http://localhost:8000/healthz", timeout=5)
         if response.status_code == 200:
             msg = f"{timestamp} CRM is alive (GraphQL OK)"
         else:
@@ -21,8 +39,8 @@ def log_crm_heartbeat():
     except Exception as e:
         msg = f"{timestamp} CRM is alive (GraphQL unreachable: {e})"
 
-    with open(log_file, "a") as f:
-        f.write(msg + "\n")
+    # Buffered; flushed when the buffer fills or at interpreter shutdown.
+    _heartbeat_logger.info(msg)
 
 
 def updateLowStockProducts():
@@ -35,6 +53,13 @@ def updateLowStockProducts():
         f.write(msg + "\n")
 
 
+HELLO_QUERY = gql("""
+query {
+    hello
+}
+""")
+
+
 def check_graphql_hello():
     transport = RequestsHTTPTransport(
         url="http://localhost:8000/graphql",
@@ -42,16 +67,10 @@ def check_graphql_hello():
         retries=3,
     )
 
-    client = Client(transport=transport, fetch_schema_from_transport=True)
-
-    query = gql("""
-    query {
-        hello
-    }
-    """)
+    client = Client(transport=transport)
 
     try:
-        response = client.execute(query)
+        response = client.execute(HELLO_QUERY)
         print("GraphQL hello response:", response)
     except Exception as e:
         print("GraphQL query failed:", str(e))
@@ -4,12 +4,30 @@ import os
 import datetime
 import logging
 import requests
+from logging.handlers import MemoryHandler
 from gql import gql, Client
 from gql.transport.requests import RequestsHTTPTransport
 
-# Setup logging
+# Setup logging; reminder lines are buffered and written in one batch
 log_file = "/tmp/order_reminders_log.txt"
-logging.basicConfig(filename=log_file, level=logging.INFO, format="%(asctime)s %(message)s")
+file_handler = logging.FileHandler(log_file)
+file_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+logging.getLogger().addHandler(
+    MemoryHandler(1024, flushLevel=logging.ERROR, target=file_handler)
+)
+logging.getLogger().setLevel(logging.INFO)
+
+# Query: orders since a given date; parsed once per process
+RECENT_ORDERS_QUERY = gql("""
+query GetRecentOrders($since: Date!) {
+    orders(orderDate_Gte: $since) {
+        id
+        customer {
+            email
+        }
+    }
+}
+""")
 
 def main():
     try:
@@ -20,21 +38,12 @@ def main():
             retries=3,
         )
 
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-
-        # Query: orders from last 7 days
-        query = gql("""
-        query GetRecentOrders {
-            orders(orderDate_Gte: "%s") {
-                id
-                customer {
-                    email
-                }
-            }
-        }
-        """ % (datetime.date.today() - datetime.timedelta(days=7)).isoformat())
+        client = Client(transport=transport)
+
+        # Orders from last 7 days
+        since = (datetime.date.today() - datetime.timedelta(days=7)).isoformat()
 
-        result = client.execute(query)
+        result = client.execute(RECENT_ORDERS_QUERY, variable_values={"since": since})
 
         orders = result.get("orders", [])
         for order in orders:
@@ -0,0 +1,49 @@
+"""
+Per-request caches for CRM model lookups by primary key.
+
+Each loader remembers the instances it has fetched for the lifetime of one
+GraphQL request, so the same customer or product is queried at most once
+while resolving a response.
+"""
+
+from .models import Customer, Product
+
+
+class ModelLoader:
+    """Fetch model instances by primary key, caching them per request."""
+
+    def __init__(self, model):
+        self.model = model
+        self._cache = {}
+
+    def load(self, key):
+        """Return the instance for ``key``, or None if it does not exist.
+
+        Keys that are not integer primary keys also give None, the same as
+        an id with no matching row.
+        """
+        try:
+            key = int(key)
+        except (TypeError, ValueError):
+            return None
+        if key not in self._cache:
+            self._cache[key] = self.model.objects.filter(pk=key).first()
+        return self._cache[key]
+
+
+class Loaders:
+    """The per-request caches attached to one request context."""
+
+    def __init__(self):
+        self.customer = ModelLoader(Customer)
+        self.product = ModelLoader(Product)
+
+
+def get_loaders(context):
+    """Return the loaders for this request context, creating them on first use."""
+    loaders = getattr(context, "loaders", None)
+    if loaders is None:
+        loaders = Loaders()
+        if context is not None:
+            context.loaders = loaders
+    return loaders
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# (index name, table, column) for the columns filtered with icontains.
+# Django renders icontains on PostgreSQL as UPPER(col::text) LIKE UPPER(...),
+# so the trigram index is built on that expression.
+TRIGRAM_INDEXES = (
+    ("crm_customer_name_trgm", "crm_customer", "name"),
+    ("crm_customer_email_trgm", "crm_customer", "email"),
+    ("crm_product_name_trgm", "crm_product", "name"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
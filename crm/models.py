@@ -18,6 +18,9 @@ class Product(models.Model):
     )
     stock = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        indexes = [models.Index(fields=["name"], name="crm_product_name_idx")]
+
     def __str__(self):
         return f"{self.name} (${self.price})"
 
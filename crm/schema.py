@@ -1,61 +1,24 @@
 """
 GraphQL schema for the CRM application.
 
-This module defines all GraphQL queries, mutations, and types
-related to customer relationship management functionality.
+This module defines all GraphQL queries and mutations related to
+customer relationship management functionality. The object types
+they return live in crm.types.
 """
 
 import re
 import graphene
 
-from .models import Product
-from crm.models import Product
 from datetime import datetime
-from decimal import Decimal
-from django.db import transaction
+from decimal import ROUND_HALF_UP, Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
 from django.utils import timezone
-from django.core.exceptions import ValidationError
-from django.core.validators import validate_email
-from graphene_django import DjangoObjectType
 from graphene_django.filter import DjangoFilterConnectionField
 
-from .filters import CustomerFilter, ProductFilter, OrderFilter
-from .models import Customer, Product, Order, OrderProduct
-
-# -------------------
-# GraphQL Types
-# -------------------
-class CustomerType(DjangoObjectType):
-    """GraphQL type for Customer model."""
-    class Meta:
-        model = Customer
-        interfaces = (graphene.relay.Node,)
-        fields = ("id", "name", "email", "phone", "created_at", "updated_at")
-        filterset_class = CustomerFilter
-
-class ProductType(DjangoObjectType):
-    """GraphQL type for Product model."""
-    class Meta:
-        model = Product
-        interfaces = (graphene.relay.Node,)
-        fields = ("id", "name", "price", "stock", "created_at", "updated_at")
-        filterset_class = ProductFilter
-
-class OrderType(DjangoObjectType):
-    """GraphQL type for Order model."""
-    class Meta:
-        model = Order
-        interfaces = (graphene.relay.Node,)
-        fields = (
-            "id",
-            "customer",
-            "products",
-            "order_date",
-            "total_amount",
-            "created_at",
-            "updated_at",
-        )
-        filterset_class = OrderFilter
+from .loaders import get_loaders
+from .models import Customer, Product, Order
+from .types import CUSTOMER_FIELDS, PRODUCT_FIELDS, CustomerType, ProductType, OrderType
 
 # -------------------
 # Input Types
@@ -115,15 +78,58 @@ class OrderFilterInput(graphene.InputObjectType):
 # Helpers / Validation
 # -------------------
 PHONE_RE = re.compile(r"^(\+?\d{7,15}|\d{3}-\d{3}-\d{4})$")
-
-def validate_phone(phone: str) -> None:
-    """Validate phone number format."""
-    if phone and not PHONE_RE.match(phone):
-        raise ValidationError("Invalid phone format. Use +1234567890 or 123-456-7890.")
+PHONE_ERROR = "Invalid phone format. Use +1234567890 or 123-456-7890."
+_phone_ok = PHONE_RE.fullmatch
+
+def is_valid_phone(phone: str) -> bool:
+    """Check phone number format without raising."""
+    return bool(_phone_ok(phone))
+
+EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+EMAIL_ERROR = "Enter a valid email address."
+_email_ok = EMAIL_RE.fullmatch
+EMAIL_MAX_LENGTH = Customer._meta.get_field("email").max_length
+
+def normalize_email(email) -> str:
+    """Strip and lowercase an email address; None becomes ""."""
+    return email.strip().lower() if email else ""
+
+# Filter input attribute -> ORM lookup, resolved once at import time
+CUSTOMER_FILTER_LOOKUPS = (
+    ("name_icontains", "name__icontains"),
+    ("email_icontains", "email__icontains"),
+    ("created_at_gte", "created_at__gte"),
+    ("created_at_lte", "created_at__lte"),
+)
+PRODUCT_FILTER_LOOKUPS = (
+    ("name_icontains", "name__icontains"),
+    ("price_gte", "price__gte"),
+    ("price_lte", "price__lte"),
+    ("stock_gte", "stock__gte"),
+    ("stock_lte", "stock__lte"),
+)
+ORDER_FILTER_LOOKUPS = (
+    ("total_amount_gte", "total_amount__gte"),
+    ("total_amount_lte", "total_amount__lte"),
+    ("order_date_gte", "order_date__gte"),
+    ("order_date_lte", "order_date__lte"),
+    ("customer_name", "customer__name__icontains"),
+    ("product_name", "products__name__icontains"),
+)
+
+def filter_kwargs(filter, lookups) -> dict:
+    """Build ORM filter kwargs from the filter input attributes that are set."""
+    return {
+        lookup: value
+        for attr, lookup in lookups
+        if (value := getattr(filter, attr, None))
+    }
+
+TWOPLACES = Decimal("0.01")
 
 def decimal_from_float(f) -> Decimal:
-    """Convert float to Decimal for precise monetary calculations."""
-    return Decimal(str(f))
+    """Convert float to a two-place Decimal for precise monetary calculations."""
+    return Decimal(repr(f)).quantize(TWOPLACES, rounding=ROUND_HALF_UP)
 
 # -------------------
 # Mutations
@@ -142,21 +148,18 @@ class CreateCustomer(graphene.Mutation):
     def mutate(root, info, input: CreateCustomerInput):
         """Create a new customer."""
         name = (input.name or "").strip()
-        email = (input.email or "").strip().lower()
+        email = normalize_email(input.email)
         phone = (input.phone or "").strip() if input.phone else None
         errors = []
 
         try:
             # Validate email
-            validate_email(email)
+            if len(email) > EMAIL_MAX_LENGTH or not _email_ok(email):
+                errors.append(EMAIL_ERROR)
             
             # Validate phone
-            if phone:
-                validate_phone(phone)
-            
-            # Check for existing email
-            if Customer.objects.filter(email=email).exists():
-                errors.append("Email already exists.")
+            if phone and not is_valid_phone(phone):
+                errors.append(PHONE_ERROR)
             
             if errors:
                 return CreateCustomer(
@@ -166,7 +169,17 @@ class CreateCustomer(graphene.Mutation):
                     errors=errors
                 )
 
-            customer = Customer.objects.create(name=name, email=email, phone=phone)
+            # The unique constraint on email rejects duplicates in the same INSERT
+            try:
+                with transaction.atomic():
+                    customer = Customer.objects.create(name=name, email=email, phone=phone)
+            except IntegrityError:
+                return CreateCustomer(
+                    customer=None,
+                    message="Validation failed",
+                    success=False,
+                    errors=["Email already exists."]
+                )
             return CreateCustomer(
                 customer=customer,
                 message="Customer created successfully",
@@ -174,13 +187,6 @@ class CreateCustomer(graphene.Mutation):
                 errors=[]
             )
 
-        except ValidationError as e:
-            return CreateCustomer(
-                customer=None,
-                message="Validation error",
-                success=False,
-                errors=[str(e)]
-            )
         except Exception as e:
             return CreateCustomer(
                 customer=None,
@@ -205,43 +211,52 @@ class BulkCreateCustomers(graphene.Mutation):
         errors = []
         emails_seen = set()
 
+        # Look up all existing emails in one query instead of one per item
+        emails = [normalize_email(item.email) for item in input]
+        existing = set(
+            Customer.objects.filter(email__in=set(emails)).values_list("email", flat=True)
+        )
+
         # Validate all inputs first
-        for idx, item in enumerate(input):
+        for idx, (item, email) in enumerate(zip(input, emails)):
             name = (item.name or "").strip()
-            email = (item.email or "").strip().lower()
             phone = (item.phone or "").strip() if item.phone else None
 
-            try:
-                if not name:
-                    raise ValidationError("Name is required.")
-                
-                validate_email(email)
-                
-                if phone:
-                    validate_phone(phone)
-                
-                if email in emails_seen:
-                    raise ValidationError(f"Duplicate email in request: {email}")
-                
-                if Customer.objects.filter(email=email).exists():
-                    raise ValidationError(f"Email already exists: {email}")
-                
-                emails_seen.add(email)
-                valid_payloads.append((name, email, phone))
-                
-            except ValidationError as e:
-                errors.append(f"Item {idx + 1}: {str(e)}")
+            if not name:
+                error = "Name is required."
+            elif phone and not is_valid_phone(phone):
+                error = PHONE_ERROR
+            elif email in emails_seen:
+                error = f"Duplicate email in request: {email}"
+            elif email in existing:
+                error = f"Email already exists: {email}"
+            elif len(email) > EMAIL_MAX_LENGTH or not _email_ok(email):
+                error = EMAIL_ERROR
+            else:
+                error = None
+
+            if error:
+                errors.append(f"Item {idx + 1}: {error}")
+                continue
+
+            emails_seen.add(email)
+            valid_payloads.append((name, email, phone))
 
         created = []
-        # Create valid records in a single transaction
+        # Create valid records in a single transaction with multi-row INSERTs
         if valid_payloads:
-            with transaction.atomic():
-                for name, email, phone in valid_payloads:
-                    created.append(Customer.objects.create(
-                        name=name, 
-                        email=email, 
-                        phone=phone
-                    ))
+            try:
+                with transaction.atomic():
+                    created = Customer.objects.bulk_create(
+                        [
+                            Customer(name=name, email=email, phone=phone)
+                            for name, email, phone in valid_payloads
+                        ],
+                        batch_size=1000,
+                    )
+            except IntegrityError:
+                # Another request inserted one of these emails after the check above
+                errors.append("Email already exists; no customers were created.")
 
         return BulkCreateCustomers(
             customers=created,
@@ -322,22 +337,29 @@ class CreateOrder(graphene.Mutation):
         errors = []
 
         try:
-            # Validate customer
-            try:
-                customer = Customer.objects.get(pk=input.customer_id)
-            except Customer.DoesNotExist:
+            # Validate customer; cached per request so repeated orders reuse it
+            customer = get_loaders(info.context).customer.load(input.customer_id)
+            if customer is None:
                 errors.append("Invalid customer ID.")
 
             # Validate products
-            if not input.product_ids or len(input.product_ids) == 0:
+            if not input.product_ids:
                 errors.append("Select at least one product.")
 
-            products = list(Product.objects.filter(pk__in=input.product_ids))
-            if len(products) != len(set(input.product_ids)):
-                # some ids invalid
-                valid_ids = {str(p.pk) for p in products}
-                bad = [pid for pid in input.product_ids if str(pid) not in valid_ids]
-                errors.append(f"Invalid product ID(s): {', '.join(map(str, bad))}")
+            try:
+                requested_ids = frozenset(int(pid) for pid in input.product_ids)
+            except (TypeError, ValueError):
+                requested_ids = frozenset()
+                errors.append("Product IDs must be integers.")
+
+            # Validate against primary keys only; no Product instances are built
+            found_ids = frozenset(
+                Product.objects.filter(pk__in=requested_ids).values_list("pk", flat=True)
+            )
+            missing = requested_ids - found_ids
+            if missing:
+                errors.append(f"Invalid product ID(s): {', '.join(map(str, sorted(missing)))}")
+            products_qs = Product.objects.filter(pk__in=found_ids)
 
             if errors:
                 return CreateOrder(
@@ -347,17 +369,22 @@ class CreateOrder(graphene.Mutation):
                     errors=errors
                 )
 
-            # Create order and compute total
+            # Compute total first so the order is inserted once with its final amount
+            total = products_qs.aggregate(total=Sum("price"))["total"] or Decimal("0.00")
+            OrderProducts = Order.products.through
             with transaction.atomic():
                 order = Order.objects.create(
                     customer=customer,
                     order_date=input.order_date or timezone.now(),
-                    total_amount=Decimal("0.00"),
+                    total_amount=total.quantize(TWOPLACES),
+                )
+                OrderProducts.objects.bulk_create(
+                    [
+                        OrderProducts(order_id=order.pk, product_id=pid)
+                        for pid in found_ids
+                    ],
+                    batch_size=1000,
                 )
-                order.products.set(products)
-                total = sum((p.price for p in products), Decimal("0.00"))
-                order.total_amount = total
-                order.save(update_fields=["total_amount"])
 
             return CreateOrder(
                 order=order,
@@ -374,6 +401,35 @@ class CreateOrder(graphene.Mutation):
                 errors=[str(e)]
             )
 
+class UpdateLowStockProducts(graphene.Mutation):
+    """Mutation to restock products that are running low."""
+    class Arguments:
+        pass
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    updated_products = graphene.List(graphene.String)
+
+    def mutate(self, info):
+        # Lock the rows and restock in one UPDATE so concurrent calls can't lose writes
+        with transaction.atomic():
+            low_stock_ids = list(
+                Product.objects.select_for_update()
+                .filter(stock__lt=10)
+                .values_list("pk", flat=True)
+            )
+            Product.objects.filter(pk__in=low_stock_ids).update(stock=F("stock") + 10)  # simulate restock
+            updated_names = [
+                f"{name}: {stock}"
+                for name, stock in Product.objects.filter(pk__in=low_stock_ids).values_list("name", "stock")
+            ]
+
+        return UpdateLowStockProducts(
+            success=True,
+            message=f"Updated {len(updated_names)} products",
+            updated_products=updated_names
+        )
+
 # -------------------
 # Query
 # -------------------
@@ -428,19 +484,11 @@ class Query(graphene.ObjectType):
     )
 
     def resolve_all_customers(self, info, filter=None, order_by=None, **kwargs):
-        qs = Customer.objects.all()
+        qs = Customer.objects.only(*CUSTOMER_FIELDS)
         if filter:
-            f = {}
-            if getattr(filter, "name_icontains", None):
-                f["name__icontains"] = filter.name_icontains
-            if getattr(filter, "email_icontains", None):
-                f["email__icontains"] = filter.email_icontains
-            if getattr(filter, "created_at_gte", None):
-                f["created_at__gte"] = filter.created_at_gte
-            if getattr(filter, "created_at_lte", None):
-                f["created_at__lte"] = filter.created_at_lte
-            if getattr(filter, "phone_pattern", None):
-                val = filter.phone_pattern
+            f = filter_kwargs(filter, CUSTOMER_FILTER_LOOKUPS)
+            val = getattr(filter, "phone_pattern", None)
+            if val:
                 if val.startswith("+"):
                     f["phone__startswith"] = val
                 else:
@@ -452,26 +500,12 @@ class Query(graphene.ObjectType):
         return qs
 
     def resolve_customer(self, info, id):
-        try:
-            return Customer.objects.get(id=id)
-        except Customer.DoesNotExist:
-            return None
+        return get_loaders(info.context).customer.load(id)
 
     def resolve_all_products(self, info, filter=None, order_by=None, **kwargs):
-        qs = Product.objects.all()
+        qs = Product.objects.only(*PRODUCT_FIELDS)
         if filter:
-            f = {}
-            if getattr(filter, "name_icontains", None):
-                f["name__icontains"] = filter.name_icontains
-            if getattr(filter, "price_gte", None):
-                f["price__gte"] = filter.price_gte
-            if getattr(filter, "price_lte", None):
-                f["price__lte"] = filter.price_lte
-            if getattr(filter, "stock_gte", None):
-                f["stock__gte"] = filter.stock_gte
-            if getattr(filter, "stock_lte", None):
-                f["stock__lte"] = filter.stock_lte
-            qs = qs.filter(**f)
+            qs = qs.filter(**filter_kwargs(filter, PRODUCT_FILTER_LOOKUPS))
             if getattr(filter, "low_stock", None):
                 qs = qs.filter(stock__lt=10)
         if order_by:
@@ -480,27 +514,13 @@ class Query(graphene.ObjectType):
         return qs
 
     def resolve_product(self, info, id):
-        try:
-            return Product.objects.get(id=id)
-        except Product.DoesNotExist:
-            return None
+        return get_loaders(info.context).product.load(id)
 
     def resolve_all_orders(self, info, filter=None, order_by=None, **kwargs):
-        qs = Order.objects.select_related("customer").prefetch_related("products").all()
+        # OrderType.get_queryset adds the customer join and products prefetch
+        qs = Order.objects.all()
         if filter:
-            f = {}
-            if getattr(filter, "total_amount_gte", None):
-                f["total_amount__gte"] = filter.total_amount_gte
-            if getattr(filter, "total_amount_lte", None):
-                f["total_amount__lte"] = filter.total_amount_lte
-            if getattr(filter, "order_date_gte", None):
-                f["order_date__gte"] = filter.order_date_gte
-            if getattr(filter, "order_date_lte", None):
-                f["order_date__lte"] = filter.order_date_lte
-            if getattr(filter, "customer_name", None):
-                f["customer__name__icontains"] = filter.customer_name
-            if getattr(filter, "product_name", None):
-                f["products__name__icontains"] = filter.product_name
+            f = filter_kwargs(filter, ORDER_FILTER_LOOKUPS)
             if getattr(filter, "product_id", None):
                 f["products__id"] = int(filter.product_id)
             qs = qs.filter(**f)
@@ -513,11 +533,7 @@ class Query(graphene.ObjectType):
 
     def resolve_order(self, info, id):
         try:
-            return (
-                Order.objects.select_related("customer")
-                .prefetch_related("products")
-                .get(id=id)
-            )
+            return OrderType.get_queryset(Order.objects.all(), info).get(id=id)
         except Order.DoesNotExist:
             return None
 
@@ -534,32 +550,4 @@ class Mutation(graphene.ObjectType):
     bulk_create_customers = BulkCreateCustomers.Field()
     create_product = CreateProduct.Field()
     create_order = CreateOrder.Field()
-
-# Create the schema
-schema = graphene.Schema(query=Query, mutation=Mutation)
-
-class UpdateLowStockProducts(graphene.Mutation):
-    class Arguments:
-        pass
-
-    success = graphene.Boolean()
-    message = graphene.String()
-    updated_products = graphene.List(graphene.String)
-
-    def mutate(self, info):
-        low_stock_products = Product.objects.filter(stock__lt=10)
-        updated_names = []
-
-        for product in low_stock_products:
-            product.stock += 10  # simulate restock
-            product.save()
-            updated_names.append(f"{product.name}: {product.stock}")
-
-        return UpdateLowStockProducts(
-            success=True,
-            message=f"Updated {len(updated_names)} products",
-            updated_products=updated_names
-        )
-
-class Mutation(graphene.ObjectType):
-    update_low_stock_products = UpdateLowStockProducts.Field()
\ No newline at end of file
+    update_low_stock_products = UpdateLowStockProducts.Field()
@@ -46,7 +46,9 @@ INSTALLED_APPS = [
 ]
 
 GRAPHENE = {
-    "SCHEMA": "alx_backend_graphql_crm.schema.schema"
+    "SCHEMA": "alx_backend_graphql_crm.schema.schema",
+    # Upper bound on rows returned by any connection field in one page
+    "RELAY_CONNECTION_MAX_LIMIT": 100,
 }
 
 CRONJOBS = [
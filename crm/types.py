@@ -0,0 +1,63 @@
+"""
+GraphQL object types for the CRM models.
+"""
+
+import graphene
+
+from django.db.models import Prefetch
+from graphene_django import DjangoObjectType
+
+from .filters import CustomerFilter, ProductFilter, OrderFilter
+from .models import Customer, Product, Order
+
+# Columns each type publishes; resolvers load only these
+CUSTOMER_FIELDS = ("id", "name", "email", "phone")
+PRODUCT_FIELDS = ("id", "name", "price", "stock")
+
+# -------------------
+# Helpers
+# -------------------
+def products_prefetch() -> Prefetch:
+    """Prefetch an order's products, loading only the columns ProductType exposes."""
+    return Prefetch(
+        "products",
+        queryset=Product.objects.only(*PRODUCT_FIELDS),
+    )
+
+# -------------------
+# GraphQL Types
+# -------------------
+class CustomerType(DjangoObjectType):
+    """GraphQL type for Customer model."""
+    class Meta:
+        model = Customer
+        interfaces = (graphene.relay.Node,)
+        fields = CUSTOMER_FIELDS
+        filterset_class = CustomerFilter
+
+class ProductType(DjangoObjectType):
+    """GraphQL type for Product model."""
+    class Meta:
+        model = Product
+        interfaces = (graphene.relay.Node,)
+        fields = PRODUCT_FIELDS
+        filterset_class = ProductFilter
+
+class OrderType(DjangoObjectType):
+    """GraphQL type for Order model."""
+    class Meta:
+        model = Order
+        interfaces = (graphene.relay.Node,)
+        fields = (
+            "id",
+            "customer",
+            "products",
+            "order_date",
+            "total_amount",
+        )
+        filterset_class = OrderFilter
+
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        """Load the customer and products up front for every order resolved."""
+        return queryset.select_related("customer").prefetch_related(products_prefetch())
@@ -1,5 +1,48 @@
+import hashlib
+import json
+
+from django.core.cache import cache
 from django.shortcuts import render
 from django.http import HttpResponse
+from graphene_django.views import GraphQLView
+from graphql import ExecutionResult
 
 def home(request):
     return HttpResponse("Hello! This is the homepage.")
+
+
+HEALTHZ_BODY = b'{"data":{"hello":"Hello, GraphQL!"}}'
+
+def healthz(request):
+    """Static heartbeat response, same shape as `{ hello }` without running GraphQL."""
+    return HttpResponse(HEALTHZ_BODY, content_type="application/json")
+
+
+class CachedGraphQLView(GraphQLView):
+    """GraphQL view that caches successful GET query results for a short time.
+
+    Only GET requests are cached; graphene-django rejects mutations over GET,
+    so cached entries are always read-only query results.
+    """
+    cache_timeout = 15
+
+    def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        if request.method.lower() != "get" or show_graphiql or not query:
+            return super().execute_graphql_request(
+                request, data, query, variables, operation_name, show_graphiql
+            )
+
+        payload = json.dumps([query, variables, operation_name], sort_keys=True, default=str)
+        cache_key = "graphql:" + hashlib.sha256(payload.encode()).hexdigest()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return ExecutionResult(data=cached)
+
+        result = super().execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+        if result is not None and not result.errors:
+            cache.set(cache_key, result.data, self.cache_timeout)
+        return result
@@ -17,10 +17,12 @@ def seed_customers():
         {"name": "David Brown", "email": "david@example.com", "phone": "+1987654321"},
     ]
 
-    created = []
-    for data in customers_data:
-        customer, _ = Customer.objects.get_or_create(**data)
-        created.append(customer)
+    emails = [data["email"] for data in customers_data]
+    Customer.objects.bulk_create(
+        [Customer(**data) for data in customers_data],
+        ignore_conflicts=True,  # email is unique; existing customers are kept
+    )
+    created = list(Customer.objects.filter(email__in=emails))
     print(f"✅ Seeded {len(created)} customers.")
     return created
 
@@ -34,10 +36,12 @@ def seed_products():
         {"name": "Headphones", "price": 89.99, "stock": 20},
     ]
 
-    created = []
-    for data in products_data:
-        product, _ = Product.objects.get_or_create(**data)
-        created.append(product)
+    names = [data["name"] for data in products_data]
+    existing = set(Product.objects.filter(name__in=names).values_list("name", flat=True))
+    Product.objects.bulk_create(
+        [Product(**data) for data in products_data if data["name"] not in existing]
+    )
+    created = list(Product.objects.filter(name__in=names))
     print(f"✅ Seeded {len(created)} products.")
     return created
 
@@ -52,14 +56,25 @@ def seed_orders(customers, products):
         for _ in range(5)
     ]
 
-    for data in orders_data:
-        total_amount = sum([p.price for p in data["products"]])
-        order = Order.objects.create(
+    orders = Order.objects.bulk_create([
+        Order(
             customer=data["customer"],
-            total_amount=total_amount,
+            total_amount=sum([p.price for p in data["products"]]),
             order_date=data["order_date"]
         )
-        order.products.set(data["products"])
+        for data in orders_data
+    ])
+
+    # Attach all order/product links with one insert
+    OrderProducts = Order.products.through
+    OrderProducts.objects.bulk_create(
+        [
+            OrderProducts(order_id=order.pk, product_id=product.pk)
+            for order, data in zip(orders, orders_data)
+            for product in set(data["products"])
+        ],
+        ignore_conflicts=True,
+    )
     print(f"✅ Seeded {len(orders_data)} orders.")
 
 